@@ -5,17 +5,249 @@ Streamlined analysis that creates sample datasets for GitHub compatibility
 """
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pa_compute
+import pyarrow.csv as pa_csv
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import seaborn as sns
+from pandas.api.types import is_datetime64_any_dtype
 import warnings
 from datasets import load_dataset
 import os
-from sklearn.linear_model import LinearRegression
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+from numba import njit
+
+# Columns the analysis reads; the sample export keeps every column
+ANALYSIS_COLUMNS = ['job_title_short', 'job_title', 'job_location', 'company_name',
+                    'salary_year_avg', 'job_posted_date']
 
 warnings.filterwarnings('ignore')
+plt.switch_backend('Agg')  # charts are only saved to disk, never shown
 plt.style.use('default')
 
+def _unique_row_ids(table):
+    """Positions of the first occurrence of every distinct row in ``table``."""
+    row_ids = pa.array(np.arange(table.num_rows))
+    first = (table.append_column('_row_id', row_ids)
+             .group_by(table.column_names)
+             .aggregate([('_row_id', 'min')]))
+    return np.sort(first.column('_row_id_min').to_numpy())
+
+def _ranked_counts(df, cols, n=10):
+    """Rank the most frequent values of each column with one counting pass.
+
+    Columns are converted to categoricals in place so later groupbys reuse
+    the same codes instead of rehashing the strings.
+    """
+    ranked = {}
+    for col in cols:
+        if not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+        cat = df[col].cat
+        codes = cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(cat.categories))
+        
+        # Partial sort: only the top n counts get ordered, not every category
+        top = np.argpartition(-counts, n - 1)[:n] if len(counts) > n else np.arange(len(counts))
+        top = top[np.lexsort((top, -counts[top]))]
+        index = pd.Index(cat.categories[top], name=col)
+        ranked[col] = pd.Series(counts[top], index=index, name='count')
+    return ranked
+
+def _stratified_positions(keys, sample_size):
+    """Pick row positions so each group keeps its share of ``sample_size``.
+
+    Groups come out in sorted key order, as groupby().apply laid them out.
+    """
+    codes, _ = pd.factorize(keys, sort=True)
+    valid = codes >= 0
+    counts = np.bincount(codes[valid])
+    quotas = np.minimum(counts, np.maximum(1, sample_size * counts // valid.sum()))
+    
+    # One stable sort lays out every group's positions back to back
+    order = np.flatnonzero(valid)[np.argsort(codes[valid], kind='stable')]
+    picks = []
+    for group, quota in zip(np.split(order, np.cumsum(counts)[:-1]), quotas):
+        np.random.shuffle(group)
+        picks.append(group[:quota])
+    return np.concatenate(picks) if picks else np.empty(0, dtype=np.intp)
+
+def _fast_linregress(y):
+    """Fit y against its position 0..n-1; returns (slope, intercept, r2)."""
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    xm = np.arange(n) - (n - 1) / 2
+    ym = y - y.mean()
+    sxy = (xm * ym).sum()
+    sxx = (xm * xm).sum()
+    syy = (ym * ym).sum()
+    slope = sxy / sxx
+    intercept = y.mean() - slope * (n - 1) / 2
+    r2 = sxy ** 2 / (sxx * syy) if syy > 0 else 1.0
+    return slope, intercept, r2
+
+class SalaryStats(NamedTuple):
+    """Salary summary shared by the printout, the chart and the exports."""
+    mean: float
+    median: float
+    q25: float
+    q75: float
+    min: float
+    max: float
+    std: float
+
+@njit(cache=True)
+def _summarize(s):
+    """Single pass over ``s`` returning (n, sum, sum of squares, min, max)."""
+    n = len(s)
+    total = 0.0
+    sumsq = 0.0
+    mn = s[0]
+    mx = s[0]
+    for i in range(n):
+        v = s[i]
+        total += v
+        sumsq += v * v
+        if v < mn:
+            mn = v
+        if v > mx:
+            mx = v
+    return n, total, sumsq, mn, mx
+
+def _salary_stats(s):
+    """Summary statistics of float64 array ``s`` from one scan plus one partial sort."""
+    n, total, sumsq, mn, mx = _summarize(s)
+    mean = total / n
+    std = np.sqrt(max(sumsq - n * mean * mean, 0.0) / (n - 1)) if n > 1 else np.nan
+    
+    # Linear interpolation between neighbouring ranks, as Series.quantile does
+    positions = np.array([0.5, 0.25, 0.75]) * (n - 1)
+    lo = np.floor(positions).astype(np.intp)
+    hi = np.ceil(positions).astype(np.intp)
+    part = np.partition(s, np.unique(np.concatenate([lo, hi])))
+    median, q25, q75 = part[lo] + (part[hi] - part[lo]) * (positions - lo)
+    return SalaryStats(mean, median, q25, q75, mn, mx, std)
+
+def _grouped_salary_stats(keys, values, min_count=0):
+    """Count/mean/median/std of ``values`` per key from one bincount sweep and one sort.
+
+    Only keys that actually occur are grouped (like ``observed=True``), and
+    groups with fewer than ``min_count`` values are dropped before the
+    result frame is built.
+    """
+    codes, uniques = pd.factorize(keys)
+    values = values.to_numpy(dtype=float, na_value=np.nan)
+    valid = (codes >= 0) & ~np.isnan(values)
+    k = len(uniques)
+    codes, values = codes[valid], values[valid]
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        count = np.bincount(codes, minlength=k)
+        mean = np.bincount(codes, weights=values, minlength=k) / count
+        dev = values - mean[codes]
+        std = np.sqrt(np.bincount(codes, weights=dev * dev, minlength=k) / (count - 1))
+    
+    # Sort by group then value once; each group's median sits mid-run
+    ordered = values[np.lexsort((values, codes))]
+    median = np.full(k, np.nan)
+    present = count > 0
+    start = (np.cumsum(count) - count)[present]
+    n = count[present]
+    median[present] = (ordered[start + (n - 1) // 2] + ordered[start + n // 2]) / 2
+    
+    keep = count >= max(min_count, 1)
+    index = pd.Index(uniques[keep], name=keys.name)
+    return pd.DataFrame({'count': count[keep], 'mean': mean[keep], 'median': median[keep], 'std': std[keep]},
+                        index=index)
+
+def _write_export(data, filepath, parquet=False):
+    """Write ``data`` as CSV with Arrow's writer, optionally alongside a parquet copy."""
+    table = pa.Table.from_pandas(data, preserve_index=False)
+    
+    # Write pure dates as dates and timestamps to the second, not nanosecond-padded
+    for i, field in enumerate(table.schema):
+        if pa.types.is_timestamp(field.type):
+            column = table.column(i)
+            dates = column.cast(pa.date32())
+            if pa_compute.all(pa_compute.equal(dates.cast(field.type), column)).as_py():
+                column = dates
+            else:
+                column = column.cast(pa.timestamp('s'), safe=False)
+            table = table.set_column(i, field.name, column)
+    # Unlike to_csv, every header and string field is quoted and booleans are written true/false
+    pa_csv.write_csv(table, filepath)
+    written = [filepath]
+    if parquet:
+        parquet_path = filepath.replace('.csv', '.parquet')
+        data.to_parquet(parquet_path, compression='snappy', index=False)
+        written.append(parquet_path)
+    return written
+
+def _render_job_categories(fig, top_jobs):
+    """Horizontal bar chart of the most common job categories."""
+    ax = fig.subplots()
+    colors = plt.cm.Set3(np.linspace(0, 1, len(top_jobs)))
+    bars = ax.barh(range(len(top_jobs)), top_jobs.values, color=colors, rasterized=True)
+    ax.set_yticks(range(len(top_jobs)), top_jobs.index)
+    ax.set_xlabel('Number of Job Postings', fontsize=12, fontweight='bold')
+    ax.set_title('Top 10 Job Categories in Data Market', fontsize=16, fontweight='bold', pad=20)
+    ax.invert_yaxis()
+    
+    # Add value labels on bars
+    ax.bar_label(bars, labels=[f'{value:,}' for value in top_jobs.values],
+                 padding=3, fontweight='bold')
+    
+    ax.grid(axis='x', alpha=0.3)
+    fig.tight_layout()
+    fig.savefig('plots/job_categories_analysis.png', dpi=150, bbox_inches='tight')
+
+def _render_salary_distribution(fig, salary_values, salary_stats):
+    """Salary histogram with mean, median and quartile markers."""
+    m, med, q25, q75 = salary_stats.mean, salary_stats.median, salary_stats.q25, salary_stats.q75
+    ax = fig.subplots()
+    hist, edges = np.histogram(salary_values, bins=50)
+    ax.bar(edges[:-1], hist, width=np.diff(edges), align='edge', alpha=0.7, color='skyblue',
+           edgecolor='black', rasterized=True)
+    ax.axvline(m, color='red', linestyle='--', linewidth=2, 
+               label=f'Mean: ${m:,.0f}')
+    ax.axvline(med, color='green', linestyle='--', linewidth=2,
+               label=f'Median: ${med:,.0f}')
+    ax.axvline(q25, color='orange', linestyle=':', linewidth=2,
+               label=f'25th Percentile: ${q25:,.0f}')
+    ax.axvline(q75, color='purple', linestyle=':', linewidth=2,
+               label=f'75th Percentile: ${q75:,.0f}')
+    
+    ax.set_title('Salary Distribution Analysis', fontsize=16, fontweight='bold')
+    ax.set_xlabel('Annual Salary (USD)', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Number of Job Postings', fontsize=12, fontweight='bold')
+    ax.legend(loc='upper right')
+    ax.grid(alpha=0.3)
+    fig.tight_layout()
+    fig.savefig('plots/salary_distribution_analysis.png', dpi=300, bbox_inches='tight')
+
+def _render_timeline(fig, monthly_jobs, slope, intercept):
+    """Monthly postings with the fitted trend line."""
+    ax = fig.subplots()
+    ax.plot(monthly_jobs['year_month'], monthly_jobs['job_count'], 
+            marker='o', linewidth=3, markersize=6, color='#2E86AB', rasterized=True)
+    ax.set_title('Job Market Trends Over Time', fontsize=16, fontweight='bold')
+    ax.set_xlabel('Date', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Number of Job Postings', fontsize=12, fontweight='bold')
+    ax.tick_params(axis='x', labelrotation=45)
+    ax.grid(True, alpha=0.3)
+    
+    # Add trend line
+    x_numeric = np.arange(len(monthly_jobs))
+    ax.plot(monthly_jobs['year_month'], intercept + slope * x_numeric, "--", color='red', alpha=0.8, linewidth=2,
+            rasterized=True,
+            label=f'Trend Line (slope: {slope:+.0f} jobs/month)')
+    ax.legend()
+    fig.tight_layout()
+    fig.savefig('plots/job_market_timeline.png', dpi=300, bbox_inches='tight')
+
 def main():
     print("="*70)
     print("JOB MARKET ANALYSIS - COMPLETE INSIGHTS")
@@ -24,15 +256,24 @@ def main():
     # Load data
     print("Loading dataset from Hugging Face...")
     ds = load_dataset("lukebarousse/data_jobs")
-    df = ds['train'].to_pandas()
-    print(f"✅ Dataset loaded successfully! Shape: {df.shape}")
+    table = ds['train'].data.table
+    print(f"✅ Dataset loaded successfully! Shape: {table.shape}")
     
-    # Basic cleaning
-    df_clean = df.drop_duplicates()
-    print(f"✅ After removing duplicates: {df_clean.shape}")
+    # Basic cleaning: duplicates are judged on the full posting, then only
+    # the analysed columns are materialized
+    row_ids = _unique_row_ids(table)
+    df_clean = table.select(ANALYSIS_COLUMNS).take(row_ids).to_pandas(types_mapper=pd.ArrowDtype)
+    print(f"✅ After removing duplicates: {(len(row_ids), table.num_columns)}")
     
-    # Convert date column
-    df_clean['job_posted_date'] = pd.to_datetime(df_clean['job_posted_date'], errors='coerce')
+    # Shrink the hot columns: int codes for strings, float32 for salaries
+    for col in ['job_title_short', 'job_location', 'company_name']:
+        df_clean[col] = df_clean[col].astype('category')
+    df_clean['salary_year_avg'] = pd.to_numeric(df_clean['salary_year_avg'], downcast='float')
+    
+    # Convert date column (posted dates are ISO 8601, e.g. '2023-06-16 13:44:15')
+    if not is_datetime64_any_dtype(df_clean['job_posted_date']):
+        df_clean['job_posted_date'] = pd.to_datetime(df_clean['job_posted_date'], format='ISO8601',
+                                                     errors='coerce', cache=True)
     
     # Create directories
     os.makedirs('plots', exist_ok=True)
@@ -42,140 +283,113 @@ def main():
     print("🎯 KEY INSIGHTS FROM 785K+ JOB POSTINGS")
     print("="*70)
     
-    # Dataset overview
+    # Dataset overview (the categoricals only hold observed values, so their
+    # category counts are the distinct counts)
+    n_companies = len(df_clean['company_name'].cat.categories)
+    n_locations = len(df_clean['job_location'].cat.categories)
+    n_titles = df_clean['job_title'].nunique()
     print(f"\n📊 MARKET OVERVIEW:")
     print(f"   • Total job postings analyzed: {len(df_clean):,}")
-    print(f"   • Unique companies hiring: {df_clean['company_name'].nunique():,}")
-    print(f"   • Job locations worldwide: {df_clean['job_location'].nunique():,}")
-    print(f"   • Distinct job roles: {df_clean['job_title'].nunique():,}")
+    print(f"   • Unique companies hiring: {n_companies:,}")
+    print(f"   • Job locations worldwide: {n_locations:,}")
+    print(f"   • Distinct job roles: {n_titles:,}")
     
     # Salary analysis
     salary_data = df_clean['salary_year_avg'].dropna()
     if len(salary_data) > 0:
+        # One float64 copy feeds both the statistics and the histogram
+        salary_values = salary_data.to_numpy(dtype=np.float64)
+        salary_stats = _salary_stats(salary_values)
+        m, med, q25, q75 = salary_stats.mean, salary_stats.median, salary_stats.q25, salary_stats.q75
         print(f"\n💰 SALARY INTELLIGENCE:")
-        print(f"   • Average annual salary: ${salary_data.mean():,.0f}")
-        print(f"   • Median salary (50th percentile): ${salary_data.median():,.0f}")
-        print(f"   • Entry level (25th percentile): ${salary_data.quantile(0.25):,.0f}")
-        print(f"   • Senior level (75th percentile): ${salary_data.quantile(0.75):,.0f}")
-        print(f"   • Salary range: ${salary_data.min():,.0f} - ${salary_data.max():,.0f}")
-        print(f"   • Standard deviation: ${salary_data.std():,.0f}")
+        print(f"   • Average annual salary: ${m:,.0f}")
+        print(f"   • Median salary (50th percentile): ${med:,.0f}")
+        print(f"   • Entry level (25th percentile): ${q25:,.0f}")
+        print(f"   • Senior level (75th percentile): ${q75:,.0f}")
+        print(f"   • Salary range: ${salary_stats.min:,.0f} - ${salary_stats.max:,.0f}")
+        print(f"   • Standard deviation: ${salary_stats.std:,.0f}")
+    
+    # Rank jobs, locations and companies in a single sweep
+    ranked = _ranked_counts(df_clean, ['job_title_short', 'job_location', 'company_name'])
     
     # Top job categories analysis
     print(f"\n🎯 TOP JOB CATEGORIES:")
-    top_jobs = df_clean['job_title_short'].value_counts().head(10)
+    top_jobs = ranked['job_title_short'].head(10)
     total_jobs = len(df_clean)
-    for i, (job, count) in enumerate(top_jobs.items(), 1):
-        percentage = (count / total_jobs) * 100
-        print(f"   {i:2d}. {job:<20} {count:>8,} posts ({percentage:5.1f}%)")
+    job_pct = top_jobs.values / total_jobs * 100.0
+    print("\n".join(f"   {i:2d}. {job:<20} {count:>8,} posts ({pct:5.1f}%)"
+                    for i, (job, count, pct) in enumerate(zip(top_jobs.index, top_jobs.values, job_pct), 1)))
     
     # Geographic insights
     print(f"\n🌍 GEOGRAPHIC DISTRIBUTION:")
-    top_locations = df_clean['job_location'].value_counts().head(5)
-    for i, (location, count) in enumerate(top_locations.items(), 1):
-        percentage = (count / total_jobs) * 100
-        print(f"   {i}. {location}: {count:,} jobs ({percentage:.1f}%)")
+    top_locations = ranked['job_location']
+    top_locations_print = top_locations.head(5)
+    location_pct = top_locations_print.values / total_jobs * 100.0
+    print("\n".join(f"   {i}. {location}: {count:,} jobs ({pct:.1f}%)"
+                    for i, (location, count, pct) in enumerate(zip(top_locations_print.index,
+                                                                   top_locations_print.values,
+                                                                   location_pct), 1)))
     
     # Company insights
     print(f"\n🏢 TOP HIRING COMPANIES:")
-    top_companies = df_clean['company_name'].value_counts().head(5)
-    for i, (company, count) in enumerate(top_companies.items(), 1):
-        print(f"   {i}. {company}: {count:,} job postings")
+    top_companies = ranked['company_name']
+    print("\n".join(f"   {i}. {company}: {count:,} job postings"
+                    for i, (company, count) in enumerate(top_companies.head(5).items(), 1)))
     
     print("\n" + "="*70)
     print("📊 CREATING PROFESSIONAL VISUALIZATIONS")
     print("="*70)
     
-    # 1. Job categories chart
-    plt.figure(figsize=(14, 8))
-    top_jobs_viz = df_clean['job_title_short'].value_counts().head(10)
-    colors = plt.cm.Set3(np.linspace(0, 1, len(top_jobs_viz)))
-    bars = plt.barh(range(len(top_jobs_viz)), top_jobs_viz.values, color=colors)
-    plt.yticks(range(len(top_jobs_viz)), top_jobs_viz.index)
-    plt.xlabel('Number of Job Postings', fontsize=12, fontweight='bold')
-    plt.title('Top 10 Job Categories in Data Market', fontsize=16, fontweight='bold', pad=20)
-    plt.gca().invert_yaxis()
-    
-    # Add value labels on bars
-    for i, (bar, value) in enumerate(zip(bars, top_jobs_viz.values)):
-        plt.text(value + 1000, i, f'{value:,}', va='center', fontweight='bold')
-    
-    plt.grid(axis='x', alpha=0.3)
-    plt.tight_layout()
-    plt.savefig('plots/job_categories_analysis.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    print("✅ Job categories analysis chart created")
-    
-    # 2. Salary distribution with insights
+    # Charts only share read-only inputs, so each one gets its own Figure
+    # (outside pyplot's global state) and they are rendered side by side
+    charts = [(_render_job_categories, Figure(figsize=(14, 8)), (top_jobs,),
+               "✅ Job categories analysis chart created")]
     if len(salary_data) > 0:
-        plt.figure(figsize=(12, 8))
-        plt.hist(salary_data, bins=50, alpha=0.7, color='skyblue', edgecolor='black')
-        plt.axvline(salary_data.mean(), color='red', linestyle='--', linewidth=2, 
-                   label=f'Mean: ${salary_data.mean():,.0f}')
-        plt.axvline(salary_data.median(), color='green', linestyle='--', linewidth=2,
-                   label=f'Median: ${salary_data.median():,.0f}')
-        plt.axvline(salary_data.quantile(0.25), color='orange', linestyle=':', linewidth=2,
-                   label=f'25th Percentile: ${salary_data.quantile(0.25):,.0f}')
-        plt.axvline(salary_data.quantile(0.75), color='purple', linestyle=':', linewidth=2,
-                   label=f'75th Percentile: ${salary_data.quantile(0.75):,.0f}')
-        
-        plt.title('Salary Distribution Analysis', fontsize=16, fontweight='bold')
-        plt.xlabel('Annual Salary (USD)', fontsize=12, fontweight='bold')
-        plt.ylabel('Number of Job Postings', fontsize=12, fontweight='bold')
-        plt.legend(loc='upper right')
-        plt.grid(alpha=0.3)
-        plt.tight_layout()
-        plt.savefig('plots/salary_distribution_analysis.png', dpi=300, bbox_inches='tight')
-        plt.close()
-        print("✅ Salary distribution analysis chart created")
+        charts.append((_render_salary_distribution, Figure(figsize=(12, 8)), (salary_values, salary_stats),
+                       "✅ Salary distribution analysis chart created"))
     
     # 3. Time series analysis
     if df_clean['job_posted_date'].notna().sum() > 0:
-        df_clean['year_month'] = df_clean['job_posted_date'].dt.to_period('M')
-        monthly_jobs = df_clean.groupby('year_month').size().reset_index(name='job_count')
-        monthly_jobs['year_month'] = monthly_jobs['year_month'].dt.to_timestamp()
+        # datetime64[M] is an int64 month count, so bin it directly without
+        # touching df_clean or building Period objects
+        months = df_clean['job_posted_date'].dropna().to_numpy().astype('datetime64[M]')
+        month_key = months.view('i8')
+        first_month = month_key.min()
+        counts = np.bincount(month_key - first_month)
+        monthly_jobs = pd.DataFrame({
+            'year_month': np.arange(first_month, first_month + len(counts)).astype('datetime64[M]')
+                            .astype('datetime64[ns]'),
+            'job_count': counts
+        })
+        
+        # The same fit drives the trend line and the forecast below
+        slope, intercept, r2 = _fast_linregress(monthly_jobs['job_count'].values)
+        charts.append((_render_timeline, Figure(figsize=(15, 8)), (monthly_jobs, slope, intercept),
+                       "✅ Job market timeline chart created"))
+    
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = [executor.submit(render, fig, *args) for render, fig, args, _ in charts]
+        for future, (*_, message) in zip(futures, charts):
+            future.result()
+            print(message)
+    
+    # Generate 6-month forecast
+    if 'monthly_jobs' in locals() and len(monthly_jobs) >= 6:
+        print(f"\n📈 MARKET FORECAST (Next 6 Months):")
+        
+        future_X = np.arange(len(monthly_jobs), len(monthly_jobs) + 6)
+        future_forecast = intercept + slope * future_X
         
-        plt.figure(figsize=(15, 8))
-        plt.plot(monthly_jobs['year_month'], monthly_jobs['job_count'], 
-                marker='o', linewidth=3, markersize=6, color='#2E86AB')
-        plt.title('Job Market Trends Over Time', fontsize=16, fontweight='bold')
-        plt.xlabel('Date', fontsize=12, fontweight='bold')
-        plt.ylabel('Number of Job Postings', fontsize=12, fontweight='bold')
-        plt.xticks(rotation=45)
-        plt.grid(True, alpha=0.3)
+        last_date = monthly_jobs['year_month'].iloc[-1]
+        future_dates = pd.date_range(start=last_date + pd.DateOffset(months=1), 
+                                   periods=6, freq='M')
         
-        # Add trend line
-        x_numeric = np.arange(len(monthly_jobs))
-        z = np.polyfit(x_numeric, monthly_jobs['job_count'], 1)
-        p = np.poly1d(z)
-        plt.plot(monthly_jobs['year_month'], p(x_numeric), "--", color='red', alpha=0.8, linewidth=2,
-                label=f'Trend Line (slope: {z[0]:+.0f} jobs/month)')
-        plt.legend()
-        plt.tight_layout()
-        plt.savefig('plots/job_market_timeline.png', dpi=300, bbox_inches='tight')
-        plt.close()
-        print("✅ Job market timeline chart created")
+        trend = "📈 Growing" if future_forecast[-1] > future_forecast[0] else "📉 Declining"
+        print(f"   Market Trend: {trend}")
+        print(f"   Forecast Method: Linear Regression (R² = {r2:.3f})")
         
-        # Generate 6-month forecast
-        if len(monthly_jobs) >= 6:
-            print(f"\n📈 MARKET FORECAST (Next 6 Months):")
-            
-            X = np.arange(len(monthly_jobs)).reshape(-1, 1)
-            y = monthly_jobs['job_count'].values
-            model = LinearRegression().fit(X, y)
-            
-            future_X = np.arange(len(monthly_jobs), len(monthly_jobs) + 6).reshape(-1, 1)
-            future_forecast = model.predict(future_X)
-            
-            last_date = monthly_jobs['year_month'].iloc[-1]
-            future_dates = pd.date_range(start=last_date + pd.DateOffset(months=1), 
-                                       periods=6, freq='M')
-            
-            trend = "📈 Growing" if future_forecast[-1] > future_forecast[0] else "📉 Declining"
-            print(f"   Market Trend: {trend}")
-            print(f"   Forecast Method: Linear Regression (R² = {model.score(X, y):.3f})")
-            
-            for date, forecast in zip(future_dates, future_forecast):
-                print(f"   {date.strftime('%Y-%m')}: {forecast:,.0f} projected jobs")
+        for date, forecast in zip(future_dates, future_forecast):
+            print(f"   {date.strftime('%Y-%m')}: {forecast:,.0f} projected jobs")
     
     print("\n" + "="*70)
     print("💼 EXPORTING POWER BI READY DATASETS")
@@ -183,35 +397,37 @@ def main():
     
     # Create sample dataset for GitHub (10K records)
     sample_size = 10000
-    df_sample = df_clean.groupby('job_title_short', group_keys=False).apply(
-        lambda x: x.sample(min(len(x), max(1, int(sample_size * len(x) / len(df_clean)))))
-    ).reset_index(drop=True)
+    chosen = _stratified_positions(df_clean['job_title_short'], sample_size)
     
-    if len(df_sample) < sample_size:
-        remaining = sample_size - len(df_sample)
-        additional = df_clean.drop(df_sample.index).sample(n=min(remaining, len(df_clean) - len(df_sample)))
-        df_sample = pd.concat([df_sample, additional]).reset_index(drop=True)
+    if len(chosen) < sample_size:
+        used = np.zeros(len(df_clean), dtype=bool)
+        used[chosen] = True
+        remaining_positions = np.flatnonzero(~used)
+        need = min(sample_size - len(chosen), len(remaining_positions))
+        extra = np.random.choice(remaining_positions, size=need, replace=False)
+        chosen = np.concatenate([chosen, extra])
+    # Power BI gets the full posting schema, not just the analysed columns
+    df_sample = table.take(row_ids[chosen]).to_pandas(types_mapper=pd.ArrowDtype)
     
     # Export files
     exports = {
         'job_market_sample_data.csv': df_sample,
         'summary_metrics.csv': pd.DataFrame({
             'Metric': ['Total Jobs', 'Unique Companies', 'Unique Locations', 'Avg Salary'],
-            'Value': [len(df_clean), df_clean['company_name'].nunique(), 
-                     df_clean['job_location'].nunique(), salary_data.mean() if len(salary_data) > 0 else 0]
+            'Value': [len(df_clean), n_companies, 
+                     n_locations, m if len(salary_data) > 0 else 0]
         }),
         'top_job_categories.csv': top_jobs.reset_index().rename(columns={'index': 'Job_Category', 'job_title_short': 'Count'}),
-        'top_companies.csv': top_companies.head(20).reset_index().rename(columns={'index': 'Company', 'company_name': 'Count'}),
-        'top_locations.csv': top_locations.head(20).reset_index().rename(columns={'index': 'Location', 'job_location': 'Count'})
+        'top_companies.csv': top_companies.head(5).reset_index().rename(columns={'index': 'Company', 'company_name': 'Count'}),
+        'top_locations.csv': top_locations.head(5).reset_index().rename(columns={'index': 'Location', 'job_location': 'Count'})
     }
     
     # Add salary analysis if available
     if len(salary_data) > 0:
-        salary_by_job = df_clean.groupby('job_title_short')['salary_year_avg'].agg([
-            'count', 'mean', 'median', 'std'
-        ]).reset_index()
+        salary_by_job = _grouped_salary_stats(df_clean['job_title_short'], df_clean['salary_year_avg'],
+                                              min_count=10).reset_index()
         salary_by_job.columns = ['Job_Category', 'Job_Count', 'Avg_Salary', 'Median_Salary', 'Salary_Std']
-        salary_by_job = salary_by_job[salary_by_job['Job_Count'] >= 10].sort_values('Avg_Salary', ascending=False)
+        salary_by_job = salary_by_job.sort_values('Avg_Salary', ascending=False)
         exports['salary_analysis.csv'] = salary_by_job
     
     # Add time series data if available
@@ -223,12 +439,15 @@ def main():
             forecast_df = pd.DataFrame({'date': future_dates, 'forecasted_jobs': future_forecast})
             exports['market_forecast.csv'] = forecast_df
     
-    # Save all exports
-    for filename, data in exports.items():
-        filepath = f'powerbi_exports/{filename}'
-        data.to_csv(filepath, index=False)
-        file_size = os.path.getsize(filepath) / 1024  # KB
-        print(f"✅ {filename:<25} ({file_size:>6.1f} KB)")
+    # Save all exports (Arrow releases the GIL while writing, so run them side by side)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(_write_export, data, f'powerbi_exports/{filename}',
+                                   parquet=filename == 'job_market_sample_data.csv')
+                   for filename, data in exports.items()]
+        written = [filepath for future in futures for filepath in future.result()]
+        for filepath in written:
+            file_size = os.path.getsize(filepath) / 1024  # KB
+            print(f"✅ {os.path.basename(filepath):<25} ({file_size:>6.1f} KB)")
     
     print("\n" + "="*70)
     print("🎉 ANALYSIS COMPLETED SUCCESSFULLY!")
@@ -236,7 +455,7 @@ def main():
     
     print(f"\n📁 Generated Files:")
     print(f"   📊 plots/ - Professional visualization charts")
-    print(f"   💼 powerbi_exports/ - Ready-to-use datasets ({len(exports)} files)")
+    print(f"   💼 powerbi_exports/ - Ready-to-use datasets ({len(written)} files)")
     
     print(f"\n🚀 Next Steps:")
     print(f"   1. 📈 View charts in the plots/ folder")